@@ -13,24 +13,61 @@ This script cryptographically verifies VCP audit trails:
 4. Anchor verification
 
 Usage:
-    python verify.py [--verbose]
+    python verify.py [--verbose] [--full-report] [--hash sha256|sha512|auto]
+
+    By default verification stops after the first failing check;
+    --full-report runs every check regardless. --hash cross-checks cached
+    Merkle trees with that digest; auto picks the faster one on this CPU.
 
 Requirements:
     Python 3.8+
     No external dependencies required
 """
 
+import functools
+import gc
 import json
 import hashlib
+import os
 import sys
+import time
+from json.encoder import encode_basestring
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+# Packs smaller than this are hashed in-process. This is a conservative
+# estimate, not a multi-core measurement: on one CPU an event costs ~12 us to
+# hash and ~5 us to pickle in the parent, and pool start-up ~12 ms, which puts
+# break-even near 5,000 events with four workers and never with two.
+PARALLEL_MIN_EVENTS = 20000
+
 # RFC 6962 Domain Separation Prefixes
 LEAF_PREFIX = b'\x00'
 INTERNAL_PREFIX = b'\x01'
+NODE_SIZE = 32  # SHA-256 digest length
+
+# SHA-256 states pre-seeded with the RFC 6962 prefixes; the Merkle hot
+# loops copy() these rather than absorbing the prefix byte for every node
+_leaf_proto = hashlib.sha256(LEAF_PREFIX)
+_internal_proto = hashlib.sha256(INTERNAL_PREFIX)
+
+# Shared canonical encoder; json.dumps builds a new encoder per call
+# whenever non-default options such as sort_keys are passed
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+# Digests for the optional tree-cache fingerprint; event hashes are always SHA-256
+CACHE_HASH_ALGORITHMS = ('sha256', 'sha512')
+CACHE_HASH_CHOICES = CACHE_HASH_ALGORITHMS + ('auto',)
+
+# Header canonicalizers generated per key set; beyond this many distinct
+# schemas headers go through the generic encoder
+MAX_HEADER_SCHEMAS = 16
+_header_canonicalizers: Dict[frozenset, Callable[[Dict], str]] = {}
+_last_header_schema: Tuple[frozenset, Optional[Callable[[Dict], str]]] = (frozenset(), None)
 
 
 @dataclass
@@ -43,12 +80,73 @@ class VerificationResult:
 
 def canonicalize_json(obj: Any) -> str:
     """RFC 8785 JSON Canonicalization (simplified)"""
-    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return _canonical_encoder.encode(obj)
+
+
+def canonicalize_json_bytes(obj: Any) -> bytes:
+    """RFC 8785 JSON Canonicalization (simplified), UTF-8 encoded"""
+    return canonicalize_json(obj).encode('utf-8')
+
+
+def _generate_header_canonicalizer(keys: frozenset) -> Callable[[Dict], str]:
+    """
+    Build a canonicalizer specialized to one header key set
+    Fields are emitted in a hard-coded sorted order without EventHash;
+    str, null and int values are encoded inline and anything else falls
+    back to the canonical encoder, so the output matches canonicalize_json.
+    """
+    fields = sorted(k for k in keys if k != 'EventHash')
+    if not fields:
+        return lambda header: '{}'
+    
+    lines = ["def canonicalize_header(h):"]
+    pieces = []
+    for i, key in enumerate(fields):
+        lines += [
+            f"    v = h[{key!r}]",
+            f"    if v.__class__ is _str: p{i} = _encode_str(v)",
+            f"    elif v is None: p{i} = 'null'",
+            f"    elif v.__class__ is _int: p{i} = _int_repr(v)",
+            f"    else: p{i} = _encode(v)",
+        ]
+        pieces += [repr(('{' if i == 0 else ',') + encode_basestring(key) + ':'), f"p{i}"]
+    lines.append(f"    return ''.join(({', '.join(pieces)}, '}}'))")
+    
+    namespace = {
+        '_str': str,
+        '_int': int,
+        '_int_repr': int.__repr__,
+        '_encode_str': encode_basestring,
+        '_encode': _canonical_encoder.encode,
+    }
+    exec('\n'.join(lines), namespace)
+    return namespace['canonicalize_header']
+
+
+def canonicalize_header(header: Dict) -> str:
+    """Canonical JSON of an event header without its EventHash field"""
+    global _last_header_schema
+    keys, canonicalize = _last_header_schema
+    if canonicalize is None or header.keys() != keys:
+        keys = frozenset(header)
+        canonicalize = _header_canonicalizers.get(keys)
+        if canonicalize is None:
+            if len(_header_canonicalizers) >= MAX_HEADER_SCHEMAS or \
+                    not all(k.__class__ is str for k in keys):
+                return _canonicalize_header_generic(header)
+            canonicalize = _header_canonicalizers[keys] = _generate_header_canonicalizer(keys)
+        _last_header_schema = (keys, canonicalize)
+    return canonicalize(header)
 
 
-def compute_sha256(data: str) -> str:
+def _canonicalize_header_generic(header: Dict) -> str:
+    """canonicalize_header for headers without a specialized canonicalizer"""
+    return canonicalize_json({k: v for k, v in header.items() if k != 'EventHash'})
+
+
+def compute_sha256(data: bytes) -> str:
     """Compute SHA-256 hash"""
-    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    return hashlib.sha256(data).hexdigest()
 
 
 def compute_event_hash(header: Dict, payload: Dict) -> str:
@@ -56,11 +154,15 @@ def compute_event_hash(header: Dict, payload: Dict) -> str:
     Compute VCP event hash
     EventHash = SHA256(Canonical(Header without EventHash) || Canonical(Payload))
     """
-    header_copy = {k: v for k, v in header.items() if k != 'EventHash'}
-    canonical_header = canonicalize_json(header_copy)
-    canonical_payload = canonicalize_json(payload)
-    hash_input = canonical_header + canonical_payload
-    return compute_sha256(hash_input)
+    return compute_event_digest(header, payload).hex()
+
+
+def compute_event_digest(header: Dict, payload: Dict) -> bytes:
+    """Compute VCP event hash as raw SHA-256 bytes"""
+    h = hashlib.sha256()
+    h.update(canonicalize_header(header).encode('utf-8'))
+    h.update(canonicalize_json_bytes(payload))
+    return h.digest()
 
 
 def compute_merkle_hash(data: bytes, is_leaf: bool) -> bytes:
@@ -69,108 +171,344 @@ def compute_merkle_hash(data: bytes, is_leaf: bool) -> bytes:
     Leaf: H(0x00 || data)
     Internal: H(0x01 || left || right)
     """
-    prefix = LEAF_PREFIX if is_leaf else INTERNAL_PREFIX
-    return hashlib.sha256(prefix + data).digest()
+    h = (_leaf_proto if is_leaf else _internal_proto).copy()
+    h.update(data)
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=65536)
+def hash_internal_pair(left: bytes, right: bytes) -> bytes:
+    """
+    Memoized RFC 6962 internal hash H(0x01 || left || right)
+    Audit paths in one batch share their upper levels; the cache is cleared
+    between batches and after each run to bound memory.
+    """
+    h = _internal_proto.copy()
+    h.update(left)
+    h.update(right)
+    return h.digest()
+
+
+def hash_leaf_batch(data: List[bytes]) -> List[bytes]:
+    """Batch RFC 6962 leaf hash: H(0x00 || data) for every item"""
+    copy = _leaf_proto.copy
+    out = []
+    append = out.append
+    for item in data:
+        h = copy()
+        h.update(item)
+        append(h.digest())
+    return out
+
+
+def hash_internal_batch(nodes: memoryview, out: memoryview):
+    """
+    Batch RFC 6962 internal hash over one contiguous tree level
+    Writes H(0x01 || left || right) for each pair of 32-byte nodes into out;
+    an odd node at the end is paired with itself.
+    """
+    copy = _internal_proto.copy
+    digests = []
+    append = digests.append
+    paired = len(nodes) - len(nodes) % (2 * NODE_SIZE)
+    for i in range(0, paired, 2 * NODE_SIZE):
+        h = copy()
+        h.update(nodes[i:i + 2 * NODE_SIZE])
+        append(h.digest())
+    if paired < len(nodes):
+        last = nodes[paired:]
+        h = copy()
+        h.update(last)
+        h.update(last)
+        append(h.digest())
+    out[:] = b''.join(digests)
+
+
+@dataclass
+class MerkleTree:
+    """
+    Every level of a Merkle tree packed into one preallocated buffer
+    Level k holds sizes[k] nodes of NODE_SIZE bytes starting at offsets[k];
+    level 0 are the leaves and the last level is the root.
+    """
+    buffer: bytearray
+    offsets: List[int]
+    sizes: List[int]
+    
+    @property
+    def depth(self) -> int:
+        """Number of levels above the leaves"""
+        return len(self.sizes) - 1
+    
+    @property
+    def root(self) -> bytes:
+        return self.node(self.depth, 0)
+    
+    def node(self, level: int, index: int) -> bytes:
+        start = self.offsets[level] + index * NODE_SIZE
+        return bytes(self.buffer[start:start + NODE_SIZE])
+
+
+def build_merkle_tree(leaves: List[bytes]) -> MerkleTree:
+    """
+    Build every level of the Merkle tree from RFC 6962 leaf hashes
+    All levels are written bottom-up into a single buffer, so no per-node
+    objects are allocated.
+    """
+    sizes = [len(leaves)]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    offsets = []
+    total = 0
+    for size in sizes:
+        offsets.append(total)
+        total += size * NODE_SIZE
+    
+    buffer = bytearray(total)
+    buffer[:sizes[0] * NODE_SIZE] = b''.join(leaves)
+    view = memoryview(buffer)
+    for level in range(1, len(sizes)):
+        src, dst = offsets[level - 1], offsets[level]
+        hash_internal_batch(view[src:dst], view[dst:dst + sizes[level] * NODE_SIZE])
+    return MerkleTree(buffer=buffer, offsets=offsets, sizes=sizes)
+
+
+@functools.lru_cache(maxsize=None)
+def select_cache_hash(budget: float = 0.001) -> str:
+    """
+    Pick the faster cache fingerprint digest on this CPU
+    SHA-512 often outruns SHA-256 on 64-bit hosts without SHA extensions.
+    Timed once per process; later calls return the cached choice.
+    """
+    block = bytes(4096)
+    best_name, best_rate = CACHE_HASH_ALGORITHMS[0], 0.0
+    for name in CACHE_HASH_ALGORITHMS:
+        h = hashlib.new(name)
+        rounds = 0
+        start = now = time.perf_counter()
+        while now - start < budget:
+            h.update(block)
+            rounds += 1
+            now = time.perf_counter()
+        rate = rounds / (now - start)
+        if rate > best_rate:
+            best_name, best_rate = name, rate
+    return best_name
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON evidence file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _verify_event_hash(event: Dict) -> Tuple[bool, Dict, bytes]:
+    """
+    Recompute a single event's hash and its RFC 6962 leaf hash
+    Module-level and free of verifier state so it can run in worker processes.
+    """
+    header = event.get('Header', {})
+    stored_hash = header.get('EventHash', '')
+    
+    # Extract payload
+    payload = {k: v for k, v in event.items() if k != 'Header'}
+    
+    # Compute hash, plus the Merkle leaf while the digest is at hand
+    digest = compute_event_digest(header, payload)
+    computed_hash = digest.hex()
+    leaf_hash = compute_merkle_hash(digest, is_leaf=True)
+    
+    return computed_hash == stored_hash, {
+        'event_id': header.get('EventID'),
+        'computed_hash': computed_hash,
+        'stored_hash': stored_hash
+    }, leaf_hash
 
 
 class VCPVerifier:
     """VCP Evidence Pack Verifier"""
     
-    def __init__(self, evidence_path: str, verbose: bool = False):
+    def __init__(self,
+                 evidence_path: str,
+                 verbose: bool = False,
+                 workers: Optional[int] = None,
+                 cache_hash: Optional[str] = None,
+                 fail_fast: bool = True):
+        if cache_hash is not None and cache_hash not in CACHE_HASH_CHOICES:
+            raise ValueError(f"Unsupported cache hash: {cache_hash}")
         self.evidence_path = Path(evidence_path)
         self.verbose = verbose
+        self.workers = workers  # None = one per CPU, 1 = always serial
+        self.fail_fast = fail_fast
+        # None = no cached-tree cross-check; 'auto' times the digests once per process
+        self._hash_name = select_cache_hash() if cache_hash == 'auto' else cache_hash
         self.events = None
         self.batches = None
         self.anchors = None
+        self._hash_bytes: Dict[str, bytes] = {}
+        self._leaf_hashes: Dict[str, bytes] = {}  # Verified EventHash -> leaf
+        self._audit_paths: Dict[Tuple[int, int], Tuple[int, List[bytes]]] = {}
+        self._tree_cache: Dict[str, Tuple[MerkleTree, Optional[bytes]]] = {}
+        self._checked_trees: set = set()
+        self._out_buf: List[str] = []
+        self._buffered = False
         
     def log(self, message: str):
         """Print verbose log"""
         if self.verbose:
-            print(f"  [DEBUG] {message}")
+            self._emit(f"  [DEBUG] {message}")
+    
+    def _emit(self, line: str = ''):
+        """Print a report line, or queue it while run_verification is active"""
+        if self._buffered:
+            self._out_buf.append(line)
+        else:
+            print(line)
+    
+    def _flush_output(self):
+        """Write all queued report lines with a single stdout write"""
+        if self._out_buf:
+            text = '\n'.join(self._out_buf) + '\n'
+            self._out_buf.clear()
+            sys.stdout.write(text)
+            sys.stdout.flush()
     
     def load_data(self) -> bool:
         """Load all evidence data"""
         try:
-            events_file = self.evidence_path / "events.json"
-            with open(events_file, 'r', encoding='utf-8') as f:
-                self.events = json.load(f)
+            self.events = load_json(self.evidence_path / "events.json")
             self.log(f"Loaded {len(self.events.get('events', []))} events")
             
-            batches_file = self.evidence_path / "batches.json"
-            with open(batches_file, 'r', encoding='utf-8') as f:
-                self.batches = json.load(f)
+            self.batches = load_json(self.evidence_path / "batches.json")
             self.log(f"Loaded {len(self.batches.get('batches', []))} batches")
             
-            anchors_file = self.evidence_path / "anchors.json"
-            with open(anchors_file, 'r', encoding='utf-8') as f:
-                self.anchors = json.load(f)
+            self.anchors = load_json(self.evidence_path / "anchors.json")
             self.log(f"Loaded {len(self.anchors.get('anchors', []))} anchors")
             
+            self._index_audit_paths()
             return True
         except Exception as e:
-            print(f"Error loading data: {e}")
+            self._emit(f"Error loading data: {e}")
             return False
     
-    def verify_event_hash(self, event: Dict) -> VerificationResult:
+    def _hex_to_bytes(self, h: str) -> bytes:
+        """Return the bytes of a hex hash, decoding each distinct hash once"""
+        if h.__class__ is not str:
+            return bytes.fromhex(h)  # Raises the usual error for the caller
+        cached = self._hash_bytes.get(h)
+        if cached is None:
+            cached = self._hash_bytes[h] = bytes.fromhex(h)
+        return cached
+    
+    def _batch_leaves(self, event_hashes: List[str]) -> List[bytes]:
         """
-        Cryptographically verify a single event's hash
+        Merkle leaves for a batch
+        Reuses leaves computed during event hash verification; only hashes
+        absent from the event log are decoded and hashed here.
         """
-        header = event.get('Header', {})
-        stored_hash = header.get('EventHash', '')
+        if not event_hashes:
+            return []
+        cached = self._leaf_hashes
+        missing = [h for h in event_hashes if h not in cached]
+        if not missing:
+            return [cached[h] for h in event_hashes]
         
-        # Extract payload
-        payload = {k: v for k, v in event.items() if k != 'Header'}
-        
-        # Compute hash
-        computed_hash = compute_event_hash(header, payload)
-        
-        if computed_hash == stored_hash:
-            self.log(f"Event {header.get('EventID', 'unknown')[:16]}... VERIFIED")
+        extra = dict(zip(missing, hash_leaf_batch([self._hex_to_bytes(h) for h in missing])))
+        return [cached[h] if h in cached else extra[h] for h in event_hashes]
+    
+    def prepare_audit_path(self, audit_path: List[Dict]) -> Tuple[int, List[bytes]]:
+        """
+        Convert an AuditPath into (left_bits, siblings)
+        Bit i of left_bits is set when step i has position 'left'.
+        """
+        left_bits = 0
+        siblings = []
+        for i, step in enumerate(audit_path):
+            if step['position'] == 'left':
+                left_bits |= 1 << i
+            siblings.append(self._hex_to_bytes(step['hash']))
+        return left_bits, siblings
+    
+    def _index_audit_paths(self):
+        """Prepare every inclusion proof's audit path once, keyed by position"""
+        self._audit_paths = {}
+        for batch_index, batch in enumerate(self.batches.get('batches', [])):
+            proofs = batch.get('InclusionProofs', [])
+            if not isinstance(proofs, list):
+                continue  # Reported by the inclusion proof check
+            for proof_index, proof in enumerate(proofs):
+                try:
+                    self._audit_paths[batch_index, proof_index] = \
+                        self.prepare_audit_path(proof.get('AuditPath', []))
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    pass  # Reported by the inclusion proof check
+    
+    def _event_result(self, passed: bool, details: Dict, leaf_hash: bytes) -> VerificationResult:
+        """Wrap a _verify_event_hash outcome in a VerificationResult"""
+        if passed:
+            # Computed == stored, so this is also the leaf for the stored hash
+            self._leaf_hashes[details['stored_hash']] = leaf_hash
+            self.log(f"Event {(details.get('event_id') or 'unknown')[:16]}... VERIFIED")
             return VerificationResult(
                 passed=True,
                 message=f"Event hash cryptographically verified",
-                details={
-                    'event_id': header.get('EventID'),
-                    'computed_hash': computed_hash,
-                    'stored_hash': stored_hash
-                }
+                details=details
             )
         else:
             return VerificationResult(
                 passed=False,
                 message=f"Event hash MISMATCH",
-                details={
-                    'event_id': header.get('EventID'),
-                    'computed_hash': computed_hash,
-                    'stored_hash': stored_hash
-                }
+                details=details
             )
     
+    def verify_event_hash(self, event: Dict) -> VerificationResult:
+        """
+        Cryptographically verify a single event's hash
+        """
+        return self._event_result(*_verify_event_hash(event))
+    
+    def verify_event_hashes(self, events: List[Dict]) -> List[VerificationResult]:
+        """
+        Verify all event hashes, fanning out to worker processes for large packs
+        """
+        workers = self.workers or os.cpu_count() or 1
+        if workers > 1 and len(events) >= PARALLEL_MIN_EVENTS:
+            chunksize = max(1, len(events) // (4 * workers))
+            self.log(f"Verifying event hashes on {workers} processes (chunksize {chunksize})")
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    outcomes = list(executor.map(_verify_event_hash, events, chunksize=chunksize))
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                # No semaphores or /dev/shm, or a worker died; hash in-process instead
+                self.log(f"Process pool unavailable ({e!r}); verifying serially")
+                outcomes = map(_verify_event_hash, events)
+        else:
+            outcomes = map(_verify_event_hash, events)
+        return [self._event_result(*outcome) for outcome in outcomes]
+    
     def verify_hash_chain(self, events: List[Dict]) -> VerificationResult:
         """
         Verify hash chain continuity
         """
-        chain_errors = []
-        prev_hash = None
+        headers = [e.get('Header', {}) for e in events]
+        prev_hashes = [h.get('PrevHash') for h in headers]
+        event_hashes = [h.get('EventHash') for h in headers]
         
-        for i, event in enumerate(events):
-            header = event.get('Header', {})
-            current_prev = header.get('PrevHash')
-            current_hash = header.get('EventHash')
-            
-            if i == 0:
-                if current_prev is not None:
-                    self.log(f"First event has PrevHash (acceptable)")
-            else:
-                if current_prev != prev_hash:
+        if prev_hashes and prev_hashes[0] is not None:
+            self.log(f"First event has PrevHash (acceptable)")
+        
+        # Happy path is a single C-level list comparison; breaks are only
+        # located when it fails
+        chain_errors = []
+        if prev_hashes[1:] != event_hashes[:-1]:
+            for i in range(1, len(headers)):
+                if prev_hashes[i] != event_hashes[i - 1]:
                     chain_errors.append({
                         'event_index': i,
-                        'event_id': header.get('EventID'),
-                        'expected': prev_hash,
-                        'found': current_prev
+                        'event_id': headers[i].get('EventID'),
+                        'expected': event_hashes[i - 1],
+                        'found': prev_hashes[i]
                     })
-            
-            prev_hash = current_hash
         
         if chain_errors:
             return VerificationResult(
@@ -186,25 +524,40 @@ class VCPVerifier:
         )
     
     def verify_merkle_proof(self, 
-                           event_hash: str, 
-                           audit_path: List[Dict],
-                           merkle_root: str) -> VerificationResult:
+                           event_hash: bytes, 
+                           audit_path: Tuple[int, List[bytes]],
+                           merkle_root: str,
+                           leaf_index: Optional[int] = None) -> VerificationResult:
         """
         Cryptographically verify Merkle inclusion proof
+        audit_path is (left_bits, siblings) as built by prepare_audit_path.
+        When the tree for merkle_root has already been rebuilt and verified,
+        the path is compared node by node against it instead of rehashed.
         """
         try:
             # Start with leaf hash
-            current = compute_merkle_hash(bytes.fromhex(event_hash), is_leaf=True)
+            current = compute_merkle_hash(event_hash, is_leaf=True)
             self.log(f"Leaf hash: {current.hex()[:16]}...")
             
-            # Walk the audit path
-            for i, step in enumerate(audit_path):
-                sibling = bytes.fromhex(step['hash'])
-                if step['position'] == 'left':
-                    combined = sibling + current
+            left_bits, siblings = audit_path
+            if self._matches_cached_tree(current, left_bits, siblings, merkle_root, leaf_index):
+                self.log("Audit path matches the reconstructed tree")
+                return VerificationResult(
+                    passed=True,
+                    message="Merkle proof cryptographically verified",
+                    details={
+                        'computed_root': merkle_root.lower(),
+                        'expected_root': merkle_root,
+                        'audit_path_length': len(siblings)
+                    }
+                )
+            
+            # Walk the audit path; bit i set means sibling i is on the left
+            for i, sibling in enumerate(siblings):
+                if left_bits & (1 << i):
+                    current = hash_internal_pair(sibling, current)
                 else:
-                    combined = current + sibling
-                current = compute_merkle_hash(combined, is_leaf=False)
+                    current = hash_internal_pair(current, sibling)
                 self.log(f"Level {i+1}: {current.hex()[:16]}...")
             
             computed_root = current.hex()
@@ -216,7 +569,7 @@ class VCPVerifier:
                     details={
                         'computed_root': computed_root,
                         'expected_root': merkle_root,
-                        'audit_path_length': len(audit_path)
+                        'audit_path_length': len(siblings)
                     }
                 )
             else:
@@ -235,38 +588,75 @@ class VCPVerifier:
                 message=f"Merkle verification error: {e}"
             )
     
-    def verify_merkle_root(self, event_hashes: List[str], expected_root: str) -> VerificationResult:
+    def _tree_fingerprint(self, tree: MerkleTree) -> bytes:
         """
-        Rebuild entire Merkle tree and verify root
+        Auxiliary digest over all cached tree nodes (not part of the VCP spec)
+        This is a consistency assertion on the in-process cache, not tamper
+        evidence: the digest is taken and checked within the same process.
+        Only computed when a cache_hash was requested.
+        """
+        return hashlib.new(self._hash_name, tree.buffer).digest()
+    
+    def _matches_cached_tree(self,
+                             leaf: bytes,
+                             left_bits: int,
+                             siblings: List[bytes],
+                             merkle_root: str,
+                             leaf_index: Optional[int]) -> bool:
+        """
+        Check an audit path against a verified tree without hashing
+        Any disagreement returns False so the caller recomputes the root.
+        """
+        root = merkle_root.lower()
+        cached = self._tree_cache.get(root)
+        if cached is None or not isinstance(leaf_index, int):
+            return False
+        tree, fingerprint = cached
+        if fingerprint is not None and root not in self._checked_trees:
+            # Cross-check the cached tree once before trusting it
+            if self._tree_fingerprint(tree) != fingerprint:
+                self.log(f"Cached tree for {root[:16]}... failed {self._hash_name} cross-check")
+                del self._tree_cache[root]
+                return False
+            self._checked_trees.add(root)
+        if len(siblings) != tree.depth or not 0 <= leaf_index < tree.sizes[0]:
+            return False
+        if tree.node(0, leaf_index) != leaf:
+            return False
+        
+        index = leaf_index
+        for level, sibling in enumerate(siblings):
+            is_left = index & 1
+            if bool(left_bits & (1 << level)) != bool(is_left):
+                return False
+            sibling_index = index - 1 if is_left else min(index + 1, tree.sizes[level] - 1)
+            if tree.node(level, sibling_index) != sibling:
+                return False
+            index >>= 1
+        return True
+    
+    def verify_merkle_root(self, leaves: List[bytes], expected_root: str) -> VerificationResult:
+        """
+        Rebuild entire Merkle tree from its leaf hashes and verify root
         """
         try:
-            if not event_hashes:
+            if not leaves:
                 return VerificationResult(passed=False, message="No event hashes")
             
-            # Build leaf nodes
-            leaves = [compute_merkle_hash(bytes.fromhex(h), is_leaf=True) for h in event_hashes]
-            
             # Build tree upward
-            current = leaves
-            while len(current) > 1:
-                next_level = []
-                for i in range(0, len(current), 2):
-                    left = current[i]
-                    right = current[i + 1] if i + 1 < len(current) else current[i]
-                    combined = left + right
-                    parent = compute_merkle_hash(combined, is_leaf=False)
-                    next_level.append(parent)
-                current = next_level
-            
-            computed_root = current[0].hex()
+            tree = build_merkle_tree(leaves)
+            computed_root = tree.root.hex()
             
             if computed_root == expected_root.lower():
+                # Keep the verified tree so inclusion proofs can be checked against it
+                fingerprint = self._tree_fingerprint(tree) if self._hash_name else None
+                self._tree_cache[computed_root] = (tree, fingerprint)
                 return VerificationResult(
                     passed=True,
                     message="Merkle root verified by tree reconstruction",
                     details={
                         'computed_root': computed_root,
-                        'leaf_count': len(event_hashes)
+                        'leaf_count': len(leaves)
                     }
                 )
             else:
@@ -296,7 +686,7 @@ class VCPVerifier:
             proof_hash = proof.get('sha256', '')
             
             # Verify the anchor proof hash matches the merkle root hash
-            computed_proof = compute_sha256(merkle_root)
+            computed_proof = compute_sha256(merkle_root.encode('utf-8'))
             
             if computed_proof == proof_hash:
                 return VerificationResult(
@@ -326,21 +716,19 @@ class VCPVerifier:
     
     def verify_timeline(self, events: List[Dict]) -> VerificationResult:
         """Verify events are chronologically ordered"""
-        out_of_order = []
-        prev_timestamp = None
+        # One pass over pre-extracted timestamps; details only for offenders
+        timestamps = [e.get('Header', {}).get('TimestampInt', 0) for e in events]
+        offenders = [i for i, prev_ts, current_ts in zip(range(1, len(events)), timestamps, timestamps[1:])
+                     if prev_ts is not None and current_ts < prev_ts]
         
-        for i, event in enumerate(events):
-            header = event.get('Header', {})
-            current_ts = header.get('TimestampInt', 0)
-            
-            if prev_timestamp is not None and current_ts < prev_timestamp:
-                out_of_order.append({
-                    'event_index': i,
-                    'event_id': header.get('EventID'),
-                    'timestamp': header.get('TimestampISO')
-                })
-            
-            prev_timestamp = current_ts
+        out_of_order = []
+        for i in offenders:
+            header = events[i].get('Header', {})
+            out_of_order.append({
+                'event_index': i,
+                'event_id': header.get('EventID'),
+                'timestamp': header.get('TimestampISO')
+            })
         
         if out_of_order:
             return VerificationResult(
@@ -356,12 +744,30 @@ class VCPVerifier:
     
     def run_verification(self) -> Dict:
         """Run complete verification suite"""
-        print("=" * 60)
-        print("VCP Evidence Pack Verification Report")
-        print("=" * 60)
-        print(f"Evidence Path: {self.evidence_path}")
-        print(f"Verification Time: {datetime.now(timezone.utc).isoformat()}")
-        print()
+        # Report lines are buffered and written once per phase. The cyclic GC
+        # is paused for the run: the many short-lived dicts built while
+        # hashing would otherwise trigger repeated collections. It is only
+        # re-enabled afterwards, not forced; a CLI run exits straight away.
+        self._buffered = True
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._run_verification()
+        finally:
+            hash_internal_pair.cache_clear()  # Don't hold the last batch's nodes
+            if gc_was_enabled:
+                gc.enable()
+            self._flush_output()
+            self._buffered = False
+    
+    def _run_verification(self) -> Dict:
+        self._emit("=" * 60)
+        self._emit("VCP Evidence Pack Verification Report")
+        self._emit("=" * 60)
+        self._emit(f"Evidence Path: {self.evidence_path}")
+        self._emit(f"Verification Time: {datetime.now(timezone.utc).isoformat()}")
+        self._emit()
+        self._flush_output()
         
         if not self.load_data():
             return {'passed': False, 'error': 'Failed to load evidence data'}
@@ -379,98 +785,145 @@ class VCPVerifier:
         batches = self.batches.get('batches', [])
         anchors = self.anchors.get('anchors', [])
         
-        print(f"Total Events: {len(events)}")
-        print(f"Total Batches: {len(batches)}")
-        print(f"Total Anchors: {len(anchors)}")
-        print()
+        self._emit(f"Total Events: {len(events)}")
+        self._emit(f"Total Batches: {len(batches)}")
+        self._emit(f"Total Anchors: {len(anchors)}")
+        self._emit()
+        self._flush_output()
         
         # 1. Event Hash Verification (Cryptographic)
-        print("Event Hash Verification (SHA-256):")
+        self._emit("Event Hash Verification (SHA-256):")
         event_pass = 0
         event_fail = 0
-        for event in events:
-            result = self.verify_event_hash(event)
+        for result in self.verify_event_hashes(events):
             results['event_hashes'].append(result)
             if result.passed:
                 event_pass += 1
             else:
                 event_fail += 1
-                print(f"  ✗ {result.details}")
+                self._emit(f"  ✗ {result.details}")
         
         if event_fail == 0:
-            print(f"  ✓ All {event_pass} event hashes cryptographically verified")
+            self._emit(f"  ✓ All {event_pass} event hashes cryptographically verified")
         else:
-            print(f"  ✗ {event_fail}/{len(events)} events failed hash verification")
-        print()
+            self._emit(f"  ✗ {event_fail}/{len(events)} events failed hash verification")
+        self._emit()
+        self._flush_output()
+        
+        summary = {
+            'total_events': len(events),
+            'total_batches': len(batches),
+            'total_anchors': len(anchors),
+            'event_hash_pass': event_pass,
+            'event_hash_fail': event_fail
+        }
+        if self._halted(event_fail == 0, 'event hash', summary):
+            return self._finish(results, summary, False)
         
         # 2. Hash Chain Verification
-        print("Hash Chain Verification:")
+        self._emit("Hash Chain Verification:")
         results['hash_chain'] = self.verify_hash_chain(events)
         if results['hash_chain'].passed:
-            print(f"  ✓ {results['hash_chain'].message}")
+            self._emit(f"  ✓ {results['hash_chain'].message}")
         else:
-            print(f"  ✗ {results['hash_chain'].message}")
-        print()
+            self._emit(f"  ✗ {results['hash_chain'].message}")
+        self._emit()
+        self._flush_output()
+        if self._halted(results['hash_chain'].passed, 'hash chain', summary):
+            return self._finish(results, summary, False)
         
         # 3. Merkle Root Verification (Full Tree Reconstruction)
-        print("Merkle Root Verification (Tree Reconstruction):")
+        self._emit("Merkle Root Verification (Tree Reconstruction):")
+        roots_passed = True
         for batch in batches:
             event_hashes = batch.get('EventHashes', [])
             expected_root = batch.get('MerkleRoot', '')
             
-            result = self.verify_merkle_root(event_hashes, expected_root)
+            try:
+                leaf_hashes = self._batch_leaves(event_hashes)
+            except (TypeError, ValueError) as e:
+                result = VerificationResult(
+                    passed=False,
+                    message=f"Merkle reconstruction error: {e}"
+                )
+            else:
+                result = self.verify_merkle_root(leaf_hashes, expected_root)
             results['merkle_root'] = result
+            roots_passed = roots_passed and result.passed
             
             if result.passed:
-                print(f"  ✓ Merkle root: {expected_root[:32]}...")
-                print(f"    Verified by rebuilding tree from {len(event_hashes)} hashes")
+                self._emit(f"  ✓ Merkle root: {expected_root[:32]}...")
+                self._emit(f"    Verified by rebuilding tree from {len(event_hashes)} hashes")
             else:
-                print(f"  ✗ {result.message}")
-        print()
+                self._emit(f"  ✗ {result.message}")
+        self._emit()
+        self._flush_output()
+        if self._halted(roots_passed, 'Merkle root', summary):
+            return self._finish(results, summary, False)
         
         # 4. Merkle Inclusion Proof Verification
-        print("Merkle Inclusion Proof Verification:")
+        self._emit("Merkle Inclusion Proof Verification:")
         proof_count = 0
-        for batch in batches:
+        for batch_index, batch in enumerate(batches):
             proofs = batch.get('InclusionProofs', [])
-            for proof in proofs:
-                result = self.verify_merkle_proof(
-                    proof.get('EventHash', ''),
-                    proof.get('AuditPath', []),
-                    proof.get('MerkleRoot', '')
-                )
+            hash_internal_pair.cache_clear()
+            for proof_index, proof in enumerate(proofs):
+                try:
+                    event_hash = self._hex_to_bytes(proof.get('EventHash', ''))
+                    audit_path = self._audit_paths.get((batch_index, proof_index))
+                    if audit_path is None:
+                        audit_path = self.prepare_audit_path(proof.get('AuditPath', []))
+                except (KeyError, TypeError, ValueError) as e:
+                    result = VerificationResult(
+                        passed=False,
+                        message=f"Merkle verification error: {e}"
+                    )
+                else:
+                    result = self.verify_merkle_proof(
+                        event_hash,
+                        audit_path,
+                        proof.get('MerkleRoot', ''),
+                        proof.get('LeafIndex')
+                    )
                 results['merkle_proofs'].append(result)
                 proof_count += 1
                 
                 if result.passed:
-                    print(f"  ✓ Event {proof.get('EventID', 'unknown')[:16]}... verified")
+                    self._emit(f"  ✓ Event {proof.get('EventID', 'unknown')[:16]}... verified")
                 else:
-                    print(f"  ✗ {result.message}")
+                    self._emit(f"  ✗ {result.message}")
         
         if proof_count == 0:
-            print(f"  ○ No inclusion proofs to verify")
-        print()
+            self._emit(f"  ○ No inclusion proofs to verify")
+        self._emit()
+        self._flush_output()
+        if self._halted(all(r.passed for r in results['merkle_proofs']), 'inclusion proof', summary):
+            return self._finish(results, summary, False)
         
         # 5. Anchor Verification
-        print("Anchor Verification:")
+        self._emit("Anchor Verification:")
         for anchor in anchors:
             result = self.verify_anchor(anchor)
             results['anchors'].append(result)
             
             if result.passed:
-                print(f"  ✓ {result.message}")
+                self._emit(f"  ✓ {result.message}")
             else:
-                print(f"  ✗ {result.message}")
-        print()
+                self._emit(f"  ✗ {result.message}")
+        self._emit()
+        self._flush_output()
+        if self._halted(all(r.passed for r in results['anchors']), 'anchor', summary):
+            return self._finish(results, summary, False)
         
         # 6. Timeline Verification
-        print("Timeline Verification:")
+        self._emit("Timeline Verification:")
         results['timeline'] = self.verify_timeline(events)
         if results['timeline'].passed:
-            print(f"  ✓ {results['timeline'].message}")
+            self._emit(f"  ✓ {results['timeline'].message}")
         else:
-            print(f"  ✗ {results['timeline'].message}")
-        print()
+            self._emit(f"  ✗ {results['timeline'].message}")
+        self._emit()
+        self._flush_output()
         
         # Overall Result
         all_passed = (
@@ -481,38 +934,57 @@ class VCPVerifier:
             all(r.passed for r in results['anchors']) and
             results['timeline'].passed
         )
-        
-        print("=" * 60)
+        return self._finish(results, summary, all_passed)
+    
+    def _halted(self, phase_passed: bool, phase: str, summary: Dict) -> bool:
+        """Whether fail-fast mode should stop after this phase"""
+        if phase_passed or not self.fail_fast:
+            return False
+        self._emit(f"Fail-fast: stopping after {phase} failure; remaining checks skipped")
+        self._emit("(run with --full-report to see every check)")
+        self._emit()
+        self._flush_output()
+        summary['halted_after'] = phase
+        return True
+    
+    def _finish(self, results: Dict, summary: Dict, all_passed: bool) -> Dict:
+        """Print the overall verdict and build the result dict"""
+        self._emit("=" * 60)
         if all_passed:
-            print("Overall: ✓ CRYPTOGRAPHICALLY VERIFIED")
-            print()
-            print("All hashes, chains, and proofs have been independently computed")
-            print("and match the stored values. This evidence pack is authentic.")
+            self._emit("Overall: ✓ CRYPTOGRAPHICALLY VERIFIED")
+            self._emit()
+            self._emit("All hashes, chains, and proofs have been independently computed")
+            self._emit("and match the stored values. This evidence pack is authentic.")
         else:
-            print("Overall: ✗ VERIFICATION FAILED")
-            print()
-            print("Some cryptographic checks failed. Evidence may be tampered.")
-        print("=" * 60)
+            self._emit("Overall: ✗ VERIFICATION FAILED")
+            self._emit()
+            self._emit("Some cryptographic checks failed. Evidence may be tampered.")
+        self._emit("=" * 60)
         
         return {
             'passed': all_passed,
             'results': results,
-            'summary': {
-                'total_events': len(events),
-                'total_batches': len(batches),
-                'total_anchors': len(anchors),
-                'event_hash_pass': event_pass,
-                'event_hash_fail': event_fail
-            }
+            'summary': summary
         }
 
 
 def main():
     """Main entry point"""
     verbose = '--verbose' in sys.argv or '-v' in sys.argv
+    fail_fast = '--full-report' not in sys.argv
+    cache_hash = None
+    if '--hash' in sys.argv:
+        i = sys.argv.index('--hash')
+        cache_hash = sys.argv[i + 1] if i + 1 < len(sys.argv) else ''
+        if cache_hash not in CACHE_HASH_CHOICES:
+            print(f"--hash must be one of: {', '.join(CACHE_HASH_CHOICES)}", file=sys.stderr)
+            sys.exit(2)
     evidence_path = Path(__file__).parent
     
-    verifier = VCPVerifier(str(evidence_path), verbose=verbose)
+    verifier = VCPVerifier(str(evidence_path),
+                           verbose=verbose,
+                           cache_hash=cache_hash,
+                           fail_fast=fail_fast)
     result = verifier.run_verification()
     
     sys.exit(0 if result.get('passed', False) else 1)